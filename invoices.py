@@ -1,17 +1,85 @@
 # Expert-Level Invoice Generator - Optimized Architecture
 # Uses template-based approach with minimal API calls and JSON configuration
+import copy
+import functools
+import itertools
 import json
+import os
+import random
+import re
+import threading
+import time
+import types
 import datetime
-import gspread
-import holidays
-from google.oauth2.service_account import Credentials
-from typing import Dict, List, Any
+from typing import TYPE_CHECKING, Dict, List, Any, Tuple
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
 
+# gspread, google-auth and holidays are imported where they are used, so that loading
+# the config or building requests does not pay for their import time
+if TYPE_CHECKING:
+    import gspread
+    import holidays
+
+try:
+    import orjson  # Optional: faster serialization of the batchUpdate body
+except ImportError:
+    orjson = None
+
+SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
+
+# Worker threads for bulk invoice creation
+MAX_CONCURRENT_INVOICES = 5
+
+# Retries of a batchUpdate rejected by quota (429) or temporary unavailability (503),
+# waiting exponentially longer (with jitter) between attempts
+MAX_BATCH_ATTEMPTS = 6
+RETRY_INITIAL_WAIT = 1.0
+RETRY_MAX_WAIT = 32.0
+RETRY_STATUS_CODES = (429, 503)
+
 # Layout constants (only the ones actually used)
 MAX_ROWS = 30
 MAX_COLS = 6
 
+# Line items fill the table rows 19-23, between its header and the notes section
+LINE_ITEM_START_ROW = 18
+MAX_LINE_ITEMS = 5
+
+# Static text of the invoice grid, keyed by (row, column)
+STATIC_CELL_VALUES = {
+    (7, 1): 'INVOICE',
+    (10, 1): 'Invoice For:',
+    (10, 3): 'Payable To:',
+    (10, 5): 'Invoice #:',
+    (12, 1): 'PO #:',
+    (17, 1): 'Description',
+    (17, 3): 'Qty',
+    (17, 4): 'Unit Price',
+    (17, 5): 'Amount',
+    (24, 4): 'Total',
+}
+
+# Merged ranges as (start_row, end_row, start_col, end_col), end-exclusive
+MERGE_RANGES = (
+    (0, 2, 0, 6),    # Header (rows 1-2, columns A-F)
+    (2, 3, 1, 6),    # Company name (row 3, columns B-F)
+    (3, 4, 1, 6),    # Address (row 4, columns B-F)
+    (4, 5, 1, 6),    # City/Province (row 5, columns B-F)
+    (5, 6, 1, 6),    # Phone (row 6, columns B-F)
+    (7, 8, 1, 6),    # Invoice title (row 8, columns B-F)
+    (8, 9, 1, 6),    # Invoice date (row 9, columns B-F)
+    (23, 30, 0, 4),  # Notes (rows 24-30, columns A-D)
+    (24, 25, 4, 6),  # Total label (row 25, columns E-F)
+    (26, 27, 4, 6),  # Total value (row 27, columns E-F)
+)
+
+# Column widths in pixels, columns A-F
+COLUMN_WIDTHS = (30, 200, 50, 60, 80, 100)
+
+# Alternating row backgrounds of the line item table (white, light grey)
+_ALT_BG = ({'red': 1.0, 'green': 1.0, 'blue': 1.0}, {'red': 0.9, 'green': 0.9, 'blue': 0.9})
+
 # Default formatting values
 DEFAULT_ORANGE_COLOR = {'red': 0.706, 'green': 0.373, 'blue': 0.024}
 DEFAULT_FONT_FAMILY = 'Roboto'
@@ -21,31 +89,132 @@ DEFAULT_TOTAL_SIZE = 20
 DEFAULT_REGULAR_TEXT_SIZE = 10
 DEFAULT_LABEL_TEXT_SIZE = 12
 
-@dataclass
+# Empty cells are sent as {}: the updateCells fields mask clears anything a cell omits
+# Template rows are read-only and shared by reference; rows that get patched are copied first
+_EMPTY_ROW = {'values': ({},) * MAX_COLS}
+
+def _build_template_rows() -> List[Dict[str, Any]]:
+    """Build the 30x6 grid of static cell values once at import time"""
+    rows = [_EMPTY_ROW] * MAX_ROWS
+    for (row, col), value in STATIC_CELL_VALUES.items():
+        values = list(rows[row]['values'])
+        values[col] = {'userEnteredValue': {'stringValue': value}}
+        rows[row] = {'values': tuple(values)}
+    return rows
+
+_TEMPLATE_ROWS = _build_template_rows()
+
+def _user_entered_value(value: Any) -> Dict[str, Any]:
+    """Wrap a plain Python value as an ExtendedValue (None stays None)"""
+    if value is None:
+        return None
+    if isinstance(value, (int, float)) and not isinstance(value, bool):
+        return {'numberValue': value}
+    return {'stringValue': str(value)}
+
+def _cell(value: Dict[str, Any] = None, cell_format: Dict[str, Any] = None) -> Dict[str, Any]:
+    """Build CellData with only the parts that are set"""
+    cell = {}
+    if value is not None:
+        cell['userEnteredValue'] = value
+    if cell_format is not None:
+        cell['userEnteredFormat'] = cell_format
+    return cell
+
+def _column_width_request(sheet_id: int, start: int, end: int, pixel_size: int) -> Dict[str, Any]:
+    """Build an updateDimensionProperties request setting the width of columns [start, end)"""
+    return {
+        'updateDimensionProperties': {
+            'range': {'sheetId': sheet_id, 'dimension': 'COLUMNS', 'startIndex': start, 'endIndex': end},
+            'properties': {'pixelSize': pixel_size},
+            'fields': 'pixelSize'
+        }
+    }
+
+def _compact_row(values: List[Dict]) -> Dict[str, Any]:
+    """Drop trailing empty cells from a row without mutating it; an all-empty row becomes {}"""
+    end = len(values)
+    while end and not values[end - 1]:
+        end -= 1
+    return {'values': values[:end]} if end else {}
+
+def _dumps(body: Dict[str, Any]) -> bytes:
+    """Serialize a request body to compact JSON, with orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(body)
+    return json.dumps(body, separators=(',', ':')).encode('utf-8')
+
+# The only placeholders in line item descriptions; any other braces are left as written
+_WEEK_DATE_PLACEHOLDER = re.compile(r'\{week[12]_date\}')
+
+@dataclass(slots=True, frozen=True)
 class InvoiceData:
-    """Structured invoice data"""
+    """Structured invoice data; line items are stored as parallel tuples"""
     company_name: str
     service_description: str
     client_name: str
     invoice_number: int
     po_number: str
     invoice_date: str
-    line_items: List[Dict[str, Any]]
+    descriptions: Tuple[str, ...]
+    quantities: Tuple[float, ...]
+    unit_prices: Tuple[float, ...]
     currency_symbol: str = '$'
     tax_rate: float = 0.0
+    
+    @property
+    def line_items(self) -> List[Dict[str, Any]]:
+        """Line items as a list of dicts, for callers that want the per-item view"""
+        return [
+            {'description': description, 'quantity': quantity, 'unit_price': unit_price}
+            for description, quantity, unit_price in zip(self.descriptions, self.quantities, self.unit_prices)
+        ]
+
+@functools.lru_cache(maxsize=8)
+def _parse_config(path: str, mtime: float) -> Dict[str, Any]:
+    """Parse a JSON config file; cached per (path, mtime) so edits are picked up.
+    
+    The returned dict is the cached copy itself; callers hand out deep copies of it.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return json.load(f)
+
+@functools.lru_cache(maxsize=64)
+def _format_week_date(today: datetime.date, week_offset: int) -> str:
+    """Format a line item's week date, memoized per (day, offset)"""
+    return (today + datetime.timedelta(days=week_offset)).strftime('%B %d')
 
 class InvoiceConfigLoader:
     """Load and process invoice configuration from JSON"""
     
-    def __init__(self, config_file: str = 'invoice_config.json'):
+    def __init__(self, config_file: str = 'invoice_config.json', config_dict: Dict[str, Any] = None):
         self.config_file = config_file
-        self.config = self._load_config()
+        # An already-built config (e.g. from a bulk job) skips file I/O entirely
+        self.config = config_dict if config_dict is not None else self._load_config()
+        
+        # Resolve formatting and notes settings against their defaults once
+        formatting_config = self.get_formatting_config()
+        self.formatting = types.SimpleNamespace(
+            orange_color=self._validate_color(formatting_config.get('company_name_color', DEFAULT_ORANGE_COLOR)),
+            font_family=formatting_config.get('font_family', DEFAULT_FONT_FAMILY),
+            company_name_size=formatting_config.get('company_name_size', DEFAULT_COMPANY_NAME_SIZE),
+            invoice_title_size=formatting_config.get('invoice_title_size', DEFAULT_INVOICE_TITLE_SIZE),
+            total_size=formatting_config.get('total_size', DEFAULT_TOTAL_SIZE),
+            regular_text_size=formatting_config.get('regular_text_size', DEFAULT_REGULAR_TEXT_SIZE),
+            label_text_size=formatting_config.get('label_text_size', DEFAULT_LABEL_TEXT_SIZE)
+        )
+        notes_config = self.get_notes_config()
+        self.notes = types.SimpleNamespace(
+            include_holidays=notes_config.get('include_holidays', True),
+            custom_notes=notes_config.get('custom_notes', '')
+        )
     
     def _load_config(self) -> Dict[str, Any]:
-        """Load configuration from JSON file"""
+        """Load configuration from JSON file, reusing the parsed copy while the file is unchanged"""
         try:
-            with open(self.config_file, 'r', encoding='utf-8') as f:
-                return json.load(f)
+            mtime = os.stat(self.config_file).st_mtime
+            # Each loader gets its own copy, so editing loader.config never leaks into the cache
+            return copy.deepcopy(_parse_config(self.config_file, mtime))
         except FileNotFoundError:
             print(f"Error: {self.config_file} not found!")
             print("Please create invoice_config.json with your invoice data.")
@@ -54,26 +223,38 @@ class InvoiceConfigLoader:
             print(f"Error parsing {self.config_file}: {e}")
             exit(1)
     
+    def _validate_color(self, color: Dict[str, float]) -> Dict[str, float]:
+        """Check an RGB color from the config once and keep only its red/green/blue keys"""
+        try:
+            return {'red': color['red'], 'green': color['green'], 'blue': color['blue']}
+        except (KeyError, TypeError):
+            print(f"Error in {self.config_file}: company_name_color needs 'red', 'green' and 'blue' values")
+            exit(1)
+    
     def get_invoice_data(self) -> InvoiceData:
         """Convert JSON config to InvoiceData object"""
+        now = datetime.datetime.now()
+        today = now.date()
+        
         # Calculate invoice date
-        invoice_date = datetime.datetime.now() + datetime.timedelta(days=self.config['invoice'].get('date_offset_days', 0))
+        invoice_date = now + datetime.timedelta(days=self.config['invoice'].get('date_offset_days', 0))
+        
+        # The layout has a fixed number of line item rows; more would overwrite the notes and total
+        if len(self.config['line_items']) > MAX_LINE_ITEMS:
+            print(f"Error in {self.config_file}: at most {MAX_LINE_ITEMS} line_items fit on an invoice, "
+                  f"got {len(self.config['line_items'])}")
+            exit(1)
         
         # Process line items with dynamic dates
-        processed_line_items = []
+        descriptions = []
         for item in self.config['line_items']:
-            # Calculate week date
-            week_date = datetime.datetime.now() + datetime.timedelta(days=item['week_offset'])
-            week_date_str = week_date.strftime('%B %d')
+            # Calculate week date (formatted once per distinct offset)
+            week_date_str = _format_week_date(today, item['week_offset'])
             
-            # Replace placeholder in description
-            description = item['description'].replace('{week1_date}', week_date_str).replace('{week2_date}', week_date_str)
+            # Replace placeholders in description in a single pass
+            description = _WEEK_DATE_PLACEHOLDER.sub(lambda _: week_date_str, item['description'])
             
-            processed_line_items.append({
-                'description': description,
-                'quantity': item['quantity'],
-                'unit_price': item['unit_price']
-            })
+            descriptions.append(description)
         
         return InvoiceData(
             company_name=self.config['company']['name'],
@@ -82,7 +263,9 @@ class InvoiceConfigLoader:
             invoice_number=self.config['invoice']['number'],
             po_number=self.config['invoice']['po_number'],
             invoice_date=invoice_date.strftime('%m/%d/%Y'),
-            line_items=processed_line_items,
+            descriptions=tuple(descriptions),
+            quantities=tuple(item['quantity'] for item in self.config['line_items']),
+            unit_prices=tuple(item['unit_price'] for item in self.config['line_items']),
             currency_symbol=self.config['invoice']['currency_symbol'],
             tax_rate=self.config['invoice']['tax_rate']
         )
@@ -95,43 +278,269 @@ class InvoiceConfigLoader:
         """Get notes configuration"""
         return self.config.get('notes', {})
 
+@functools.lru_cache(maxsize=8)
+def _cell_formats(formatting_key: Tuple) -> types.SimpleNamespace:
+    """Build the CellFormat dicts of one formatting profile once; they are shared by reference.
+    
+    The font family is not part of these formats: it is applied sheet-wide by a single request,
+    so each cell only carries what differs from it.
+    """
+    company_name_size, invoice_title_size, total_size, regular_text_size, label_text_size, orange_items = formatting_key
+    # One orange dict, referenced by every format that uses it
+    orange_color = dict(orange_items)
+    regular_text = {'fontSize': regular_text_size}
+    label_text = {'bold': True, 'fontSize': label_text_size}
+    currency_number = {'type': 'CURRENCY', 'pattern': '$#,##0.00'}
+    header_padding = {'top': 10, 'bottom': 10, 'left': 0, 'right': 0}
+    return types.SimpleNamespace(
+        regular={'textFormat': regular_text, 'horizontalAlignment': 'LEFT'},
+        regular_right={'textFormat': regular_text, 'horizontalAlignment': 'RIGHT'},
+        label={'textFormat': label_text, 'horizontalAlignment': 'LEFT'},
+        company_name={
+            'textFormat': {'bold': True, 'fontSize': company_name_size, 'foregroundColor': orange_color},
+            'horizontalAlignment': 'LEFT'
+        },
+        title={
+            'textFormat': {'bold': True, 'fontSize': invoice_title_size, 'foregroundColor': orange_color},
+            'horizontalAlignment': 'LEFT'
+        },
+        header_left={'textFormat': label_text, 'horizontalAlignment': 'LEFT', 'verticalAlignment': 'MIDDLE', 'padding': header_padding},
+        header_right={'textFormat': label_text, 'horizontalAlignment': 'RIGHT', 'verticalAlignment': 'MIDDLE', 'padding': header_padding},
+        currency={'textFormat': regular_text, 'horizontalAlignment': 'RIGHT', 'numberFormat': currency_number},
+        total={
+            'textFormat': {'bold': True, 'fontSize': total_size, 'foregroundColor': orange_color},
+            'horizontalAlignment': 'RIGHT',
+            'numberFormat': currency_number
+        },
+        notes={'textFormat': regular_text, 'horizontalAlignment': 'LEFT', 'verticalAlignment': 'TOP', 'wrapStrategy': 'WRAP'},
+        header_background=orange_color
+    )
+
+def _build_cell_format_template(formats: types.SimpleNamespace) -> List[List[Dict]]:
+    """Build the userEnteredFormat of every cell in the 30x6 invoice grid"""
+    grid = [[None] * MAX_COLS for _ in range(MAX_ROWS)]
+    
+    def set_format(start_row, end_row, start_col, end_col, cell_format):
+        # Replaces the whole format, like a repeatCell with fields='userEnteredFormat'
+        for row in range(start_row, end_row):
+            for col in range(start_col, end_col):
+                grid[row][col] = cell_format
+    
+    def update_format(start_row, end_row, start_col, end_col, **fields):
+        # Only touches the given fields, like a repeatCell with fields='userEnteredFormat.<field>'
+        for row in range(start_row, end_row):
+            for col in range(start_col, end_col):
+                grid[row][col] = {**(grid[row][col] or {}), **fields}
+    
+    # Company name formatting
+    set_format(2, 3, 1, 2, formats.company_name)
+    
+    # Contact info formatting
+    set_format(3, 6, 1, 2, formats.regular)
+    
+    # Invoice title formatting
+    set_format(7, 8, 1, 2, formats.title)
+    
+    # Labels (Invoice For, Payable To, Invoice #) - Bold, size 12, with their values below - Regular, size 10.
+    # Columns C and E stay empty, so they get no format rather than a widened range.
+    for col in (1, 3, 5):
+        set_format(10, 11, col, col+1, formats.label)
+        set_format(11, 12, col, col+1, formats.regular)
+    
+    # PO Number label (row 13) and value (row 14, column B)
+    set_format(12, 13, 1, 2, formats.label)
+    set_format(12, 13, 2, 3, formats.regular)
+    set_format(13, 14, 1, 2, formats.regular)
+    
+    # Table headers formatting
+    set_format(17, 18, 1, 3, formats.header_left)
+    set_format(17, 18, 3, 6, formats.header_right)
+    
+    # Alternating row backgrounds
+    for i in range(5):  # Rows 18-22
+        row = 17 + i
+        update_format(row, row+1, 1, 6, backgroundColor=_ALT_BG[i % 2])
+    
+    # Borders
+    update_format(16, 17, 1, 6, borders={'top': {'style': 'SOLID', 'width': 1}})
+    update_format(22, 23, 1, 6, borders={'bottom': {'style': 'SOLID', 'width': 1}})
+    
+    # Total formatting
+    set_format(24, 25, 4, 5, formats.label)
+    set_format(26, 27, 4, 5, formats.total)
+    
+    # Notes formatting
+    set_format(23, 30, 1, 4, formats.notes)
+    
+    # Header background - A1:F2 is merged, so the top-left cell's fill covers the whole header
+    update_format(0, 1, 0, 1, backgroundColor=formats.header_background)
+    
+    return grid
+
+@functools.lru_cache(maxsize=8)
+def _row_template(formatting_key: Tuple) -> List[Dict]:
+    """Static rows with their formats attached, built once per formatting profile"""
+    cell_format_template = _build_cell_format_template(_cell_formats(formatting_key))
+    return [
+        {'values': tuple(
+            {**cell, 'userEnteredFormat': cell_format} if cell_format else cell
+            for cell, cell_format in zip(row['values'], row_formats)
+        )} if any(row_formats) else row
+        for row, row_formats in zip(_TEMPLATE_ROWS, cell_format_template)
+    ]
+
+@functools.lru_cache(maxsize=8)
+def _line_item_formats(formatting_key: Tuple) -> Tuple[List[Dict], ...]:
+    """Formats of each line item row: the item's text formats laid over that table row's background and borders"""
+    formats = _cell_formats(formatting_key)
+    cell_format_template = _build_cell_format_template(formats)
+    item_formats = (None, formats.regular, None, formats.regular_right, formats.currency, formats.currency)
+    
+    def row_formats(row):
+        # Item formats replace the cell format, then the row background and borders go back on top
+        row_formats = []
+        for item_format, template_format in zip(item_formats, cell_format_template[row]):
+            if item_format is None:
+                row_formats.append(template_format)
+            else:
+                kept = {field: template_format[field] for field in ('backgroundColor', 'borders')
+                        if template_format and field in template_format}
+                row_formats.append({**item_format, **kept})
+        return row_formats
+    
+    return tuple(row_formats(LINE_ITEM_START_ROW + i) for i in range(MAX_LINE_ITEMS))
+
+@functools.lru_cache(maxsize=16)
+def _layout_requests(sheet_id: int) -> Tuple[Dict[str, Any], ...]:
+    """Merge and column width requests for a sheet, built once per sheet id and shared read-only"""
+    merge_requests = [
+        {
+            'mergeCells': {
+                'range': {'sheetId': sheet_id, 'startRowIndex': start_row, 'endRowIndex': end_row, 'startColumnIndex': start_col, 'endColumnIndex': end_col},
+                'mergeType': 'MERGE_ALL'
+            }
+        }
+        for start_row, end_row, start_col, end_col in MERGE_RANGES
+    ]
+    
+    # Column width requests, one per run of equal adjacent widths
+    width_requests = []
+    start = 0
+    for pixel_size, run in itertools.groupby(COLUMN_WIDTHS):
+        end = start + len(list(run))
+        width_requests.append(_column_width_request(sheet_id, start, end, pixel_size))
+        start = end
+    
+    return tuple(merge_requests + width_requests)
+
+@functools.lru_cache(maxsize=2)
+def _canada_holidays(year: int) -> 'holidays.HolidayBase':
+    """Canadian holidays for a year and the one before it, built once instead of per invoice"""
+    import holidays
+    
+    return holidays.Canada(years=[year - 1, year])
+
+@functools.lru_cache(maxsize=4)
+def _canadian_holidays_in_period(end_date: datetime.date) -> Tuple[Dict[str, str], ...]:
+    """Canadian holidays in the two weeks up to end_date, memoized per day"""
+    start_date = end_date - datetime.timedelta(days=14)
+    # Filter the dozen or so known holidays rather than probing every day of the window;
+    # the calendar covers the previous year too, so windows crossing New Year are included
+    in_period = sorted(
+        (holiday_date, name) for holiday_date, name in _canada_holidays(end_date.year).items()
+        if start_date <= holiday_date <= end_date
+    )
+    return tuple({'date': holiday_date.strftime('%B %d'), 'name': name} for holiday_date, name in in_period)
+
+class RateLimiter:
+    """Thread-safe token bucket: allows `rate` calls per second with bursts of up to `capacity`"""
+    
+    def __init__(self, rate: float = 1.0, capacity: int = 1):
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+    
+    def acquire(self) -> None:
+        """Block until a call may proceed"""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+            self._last = now
+            if self._tokens < 1:
+                # Holding the lock while waiting keeps callers in arrival order
+                time.sleep((1 - self._tokens) / self.rate)
+                self._last = time.monotonic()
+                self._tokens = 0.0
+            else:
+                self._tokens -= 1
+
+@functools.lru_cache(maxsize=None)
+def connect_once(credentials_file: str, spreadsheet_id: str) -> Tuple['gspread.Client', 'gspread.Spreadsheet']:
+    """Authorize and open a spreadsheet once per process; later calls reuse the same client"""
+    import gspread
+    from google.auth.transport.requests import AuthorizedSession
+    from google.oauth2.service_account import Credentials
+    
+    creds = Credentials.from_service_account_file(credentials_file, scopes=SCOPES)
+    # One authorized session: every call reuses its keep-alive TLS connections. Its default
+    # adapter already keeps up to 10 per host, enough for the workers of create_invoices
+    session = AuthorizedSession(creds)
+    gc = gspread.Client(auth=creds, session=session)
+    return gc, gc.open_by_key(spreadsheet_id)
+
 class InvoiceTemplate:
     """Template-based invoice generator with minimal API calls"""
     
-    def __init__(self, spreadsheet_id: str, credentials_file: str, config_loader: InvoiceConfigLoader = None):
+    def __init__(self, spreadsheet_id: str = None, credentials_file: str = None, config_loader: InvoiceConfigLoader = None,
+                 spreadsheet: 'gspread.Spreadsheet' = None):
         self.spreadsheet_id = spreadsheet_id
         self.credentials_file = credentials_file
         self.config_loader = config_loader or InvoiceConfigLoader()
-        self.gc = None
-        self.spreadsheet = None
+        # A prebuilt spreadsheet (e.g. from connect_once) lets a batch job share one client
+        self.gc = spreadsheet.client if spreadsheet is not None else None
+        self.spreadsheet = spreadsheet
+        # Spaces out batchUpdate writes (sheet creation and the invoice batch) when invoices are created concurrently
+        self.rate_limiter = RateLimiter()
         
     def connect(self) -> None:
-        """Single connection setup"""
-        SCOPES = ['https://www.googleapis.com/auth/spreadsheets']
-        creds = Credentials.from_service_account_file(self.credentials_file, scopes=SCOPES)
-        self.gc = gspread.authorize(creds)
-        self.spreadsheet = self.gc.open_by_key(self.spreadsheet_id)
+        """Single connection setup, shared with other templates for the same spreadsheet"""
+        self.gc, self.spreadsheet = connect_once(self.credentials_file, self.spreadsheet_id)
+    
+    @functools.cached_property
+    def formatting_config(self) -> types.SimpleNamespace:
+        """Formatting settings, looked up on the loader once per template"""
+        return self.config_loader.formatting
+    
+    @functools.cached_property
+    def notes_config(self) -> types.SimpleNamespace:
+        """Notes settings, looked up on the loader once per template"""
+        return self.config_loader.notes
         
     def create_invoice(self, data: InvoiceData = None) -> str:
-        """Create invoice with only 2 API calls total"""
+        """Create invoice with a single batchUpdate call"""
+        import gspread
+        
         try:
+            if self.spreadsheet is None:
+                self.connect()
+            
             if data is None:
                 data = self.config_loader.get_invoice_data()
             
             worksheet_title = f"Invoice {data.invoice_number}"
             
-            # Get or create worksheet
+            # Get or create worksheet; an existing one is overwritten by the updateCells request below
             try:
                 worksheet = self.spreadsheet.worksheet(worksheet_title)
-                worksheet.clear()
             except gspread.WorksheetNotFound:
+                # Adding a sheet is a batchUpdate write too, so it counts against the same quota
+                self.rate_limiter.acquire()
                 worksheet = self.spreadsheet.add_worksheet(worksheet_title, rows=30, cols=6)
             
-            # CALL 1: Batch ALL data, formatting, and formulas in one request
-            self._apply_everything_in_one_batch(worksheet, data)
-            
-            # CALL 2: Batch merging and column widths in one request
-            self._apply_merging_and_widths_in_one_batch(worksheet)
+            # Data, formatting, merging and column widths all go out in one request
+            self._apply_all_sheet_requests_in_one_batch(worksheet, self._build_rows(data))
             
             print("Invoice created successfully!")
             return worksheet.url
@@ -145,23 +554,46 @@ class InvoiceTemplate:
             raise
         
     
-    def _apply_everything_in_one_batch(self, worksheet, data: InvoiceData) -> None:
-        """Apply ALL data, formatting, and formulas in one batch request"""
-        formatting_config = self.config_loader.get_formatting_config()
-        orange_color = formatting_config.get('company_name_color', DEFAULT_ORANGE_COLOR)
-        font_family = formatting_config.get('font_family', DEFAULT_FONT_FAMILY)
-        company_name_size = formatting_config.get('company_name_size', DEFAULT_COMPANY_NAME_SIZE)
-        invoice_title_size = formatting_config.get('invoice_title_size', DEFAULT_INVOICE_TITLE_SIZE)
-        total_size = formatting_config.get('total_size', DEFAULT_TOTAL_SIZE)
-        regular_text_size = formatting_config.get('regular_text_size', DEFAULT_REGULAR_TEXT_SIZE)
-        label_text_size = formatting_config.get('label_text_size', DEFAULT_LABEL_TEXT_SIZE)
-        
-        # Build notes content
-        notes_content = self._build_notes_content(data)
+    def create_invoices(self, invoices: List[InvoiceData], max_workers: int = MAX_CONCURRENT_INVOICES) -> List[str]:
+        """Create several invoices concurrently over the shared client, returning their URLs in order"""
+        if self.spreadsheet is None:
+            self.connect()
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            return list(executor.map(self.create_invoice, invoices))
+    
+    def _apply_all_sheet_requests_in_one_batch(self, worksheet, rows: List[Dict]) -> None:
+        """Apply values, formatting, merges and column widths with a single batchUpdate"""
+        # Order matters: cells are written and formatted before the ranges are merged
+        requests = self._build_value_and_format_requests(worksheet, rows)
+        requests.extend(self._build_merge_and_width_requests(worksheet))
+        self._batch_update(requests)
+    
+    def _batch_update(self, requests: List[Dict]) -> None:
+        """Post requests straight to the v4 spreadsheets.batchUpdate endpoint as pre-serialized JSON"""
+        from gspread.urls import SPREADSHEET_BATCH_UPDATE_URL
         
-        # Calculate total on code side
-        total_amount = sum(item['quantity'] * item['unit_price'] for item in data.line_items)
+        url = SPREADSHEET_BATCH_UPDATE_URL % self.spreadsheet.id
+        self._send_batch(url, _dumps({'requests': requests}))
+    
+    def _send_batch(self, url: str, data: bytes) -> None:
+        """POST a serialized batch, backing off and resending the same bytes on 429/503"""
+        from gspread.exceptions import APIError
         
+        wait = RETRY_INITIAL_WAIT
+        for attempt in range(1, MAX_BATCH_ATTEMPTS + 1):
+            self.rate_limiter.acquire()
+            try:
+                # The reply is never used, so skip Spreadsheet.batch_update and its JSON decode of the response
+                self.spreadsheet.client.request('post', url, data=data, headers={'Content-Type': 'application/json'})
+                return
+            except APIError as e:
+                if e.response.status_code not in RETRY_STATUS_CODES or attempt == MAX_BATCH_ATTEMPTS:
+                    raise
+            time.sleep(min(wait + random.uniform(0, wait), RETRY_MAX_WAIT))
+            wait = min(wait * 2, RETRY_MAX_WAIT)
+    
+    def _build_value_and_format_requests(self, worksheet, rows: List[Dict]) -> List[Dict]:
+        """Build the data and formatting requests for the invoice from its prebuilt cell rows"""
         # Prepare all requests
         requests = []
         
@@ -176,574 +608,108 @@ class InvoiceTemplate:
             }
         })
         
-        # 2. Update all cell values
+        # 2. Update all cell values together with their formatting
         requests.append({
             'updateCells': {
                 'range': {'sheetId': worksheet.id, 'startRowIndex': 0, 'endRowIndex': 30, 'startColumnIndex': 0, 'endColumnIndex': 6},
-                'rows': [
-                    # Row 1-2: Header background
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 3: Company name
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': data.company_name}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 4: Service Description
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': data.service_description}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 5: Empty (to maintain row count)
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 6: Empty (removed phone)
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 7: Empty
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 8: Invoice title
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'INVOICE'}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 9: Invoice date
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': data.invoice_date}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 10: Empty
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 11: Labels
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'Invoice For:'}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'Payable To:'}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'Invoice #:'}}]},
-                    # Row 12: Values
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': data.client_name}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': data.company_name}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': str(data.invoice_number)}}]},
-                     # Row 13: PO Number label only
-                     {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'PO #:'}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                     # Row 14: PO Number value (using existing empty row)
-                     {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': data.po_number}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 15: Empty
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 16: Empty
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 17: Empty
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 18: Table headers
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'Description'}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'Qty'}}, {'userEnteredValue': {'stringValue': 'Unit Price'}}, {'userEnteredValue': {'stringValue': 'Amount'}}]},
-                ] + [
-                    # Dynamic line items (rows 19, 20, etc.)
-                    {'values': [
-                        {'userEnteredValue': {'stringValue': ''}},
-                        {'userEnteredValue': {'stringValue': item['description']}},
-                        {'userEnteredValue': {'stringValue': ''}},
-                        {'userEnteredValue': {'numberValue': item['quantity']}},
-                        {'userEnteredValue': {'numberValue': item['unit_price']}},
-                        {'userEnteredValue': {'numberValue': item['quantity'] * item['unit_price']}}
-                    ]} for i, item in enumerate(data.line_items)
-                ] + [
-                    # Row 19+ (after line items): Empty rows
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 24: Notes section
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': notes_content}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 25: Total label
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': 'Total'}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 26: Empty
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 27: Total value (calculated on code side, placed in merged E27:F27)
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'numberValue': total_amount}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    # Row 28-30: Empty rows
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                    {'values': [{'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}, {'userEnteredValue': {'stringValue': ''}}]},
-                ],
-                'fields': 'userEnteredValue'
-            }
-        })
-        
-        # 3. Apply all formatting
-        # Company name formatting
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 2, 'endRowIndex': 3, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': company_name_size, 'fontFamily': font_family, 'foregroundColor': {'red': orange_color['red'], 'green': orange_color['green'], 'blue': orange_color['blue']}},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # Contact info formatting
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 3, 'endRowIndex': 6, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # Invoice title formatting
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 7, 'endRowIndex': 8, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': invoice_title_size, 'fontFamily': font_family, 'foregroundColor': {'red': orange_color['red'], 'green': orange_color['green'], 'blue': orange_color['blue']}},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # Labels formatting (Payable To, Invoice #) - Bold, size 12
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 10, 'endRowIndex': 11, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': label_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 10, 'endRowIndex': 11, 'startColumnIndex': 3, 'endColumnIndex': 4},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': label_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 10, 'endRowIndex': 11, 'startColumnIndex': 5, 'endColumnIndex': 6},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': label_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # Values formatting (client name, invoice number) - Regular, size 10
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 11, 'endRowIndex': 12, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 11, 'endRowIndex': 12, 'startColumnIndex': 3, 'endColumnIndex': 4},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 11, 'endRowIndex': 12, 'startColumnIndex': 5, 'endColumnIndex': 6},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # PO Number formatting (same as invoice number) - Rows 13-14
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 12, 'endRowIndex': 14, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': label_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
+                'rows': rows,
+                # Every field in the mask that a cell omits is cleared, which wipes any previous run
+                'fields': 'userEnteredValue,userEnteredFormat,note'
             }
         })
         
+        # 3. One sheet-wide font family; the per-cell formats above only carry the differences
         requests.append({
             'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 12, 'endRowIndex': 13, 'startColumnIndex': 2, 'endColumnIndex': 3},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # PO Number value formatting (row 14, column B)
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 13, 'endRowIndex': 14, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # Table headers formatting
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 17, 'endRowIndex': 18, 'startColumnIndex': 1, 'endColumnIndex': 3},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': label_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT',
-                        'verticalAlignment': 'MIDDLE',
-                        'padding': {'top': 10, 'bottom': 10, 'left': 0, 'right': 0}
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 17, 'endRowIndex': 18, 'startColumnIndex': 3, 'endColumnIndex': 6},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': label_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'RIGHT',
-                        'verticalAlignment': 'MIDDLE',
-                        'padding': {'top': 10, 'bottom': 10, 'left': 0, 'right': 0}
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        # Line items formatting
-        for i in range(len(data.line_items)):
-            row = 18 + i
-            # Currency formatting for unit price and amount
-            requests.append({
-                'repeatCell': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': row, 'endRowIndex': row+1, 'startColumnIndex': 4, 'endColumnIndex': 6},
-                    'cell': {
-                        'userEnteredFormat': {
-                            'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                            'horizontalAlignment': 'RIGHT',
-                            'numberFormat': {'type': 'CURRENCY', 'pattern': '$#,##0.00'}
-                        }
-                    },
-                    'fields': 'userEnteredFormat'
-                }
-            })
-            
-            # Description formatting
-            requests.append({
-                'repeatCell': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': row, 'endRowIndex': row+1, 'startColumnIndex': 1, 'endColumnIndex': 2},
-                    'cell': {
-                        'userEnteredFormat': {
-                            'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                            'horizontalAlignment': 'LEFT'
-                        }
-                    },
-                    'fields': 'userEnteredFormat'
-                }
-            })
-            
-            # Quantity formatting
-            requests.append({
-                'repeatCell': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': row, 'endRowIndex': row+1, 'startColumnIndex': 3, 'endColumnIndex': 4},
-                    'cell': {
-                        'userEnteredFormat': {
-                            'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                            'horizontalAlignment': 'RIGHT'
-                        }
-                    },
-                    'fields': 'userEnteredFormat'
-                }
-            })
-        
-        # Alternating row backgrounds
-        for i in range(5):  # Rows 18-22
-            row = 17 + i
-            bg_color = {'red': 1.0, 'green': 1.0, 'blue': 1.0} if i % 2 == 0 else {'red': 0.9, 'green': 0.9, 'blue': 0.9}
-            requests.append({
-                'repeatCell': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': row, 'endRowIndex': row+1, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                    'cell': {
-                        'userEnteredFormat': {
-                            'backgroundColor': bg_color
-                        }
-                    },
-                    'fields': 'userEnteredFormat.backgroundColor'
-                }
-            })
-        
-        # Borders
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 16, 'endRowIndex': 17, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                'cell': {
-                    'userEnteredFormat': {
-                        'borders': {'top': {'style': 'SOLID', 'width': 1}}
-                    }
-                },
-                'fields': 'userEnteredFormat.borders'
-            }
-        })
-        
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 22, 'endRowIndex': 23, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                'cell': {
-                    'userEnteredFormat': {
-                        'borders': {'bottom': {'style': 'SOLID', 'width': 1}}
-                    }
-                },
-                'fields': 'userEnteredFormat.borders'
-            }
-        })
-        
-        # Total formatting
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 24, 'endRowIndex': 25, 'startColumnIndex': 4, 'endColumnIndex': 5},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': label_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
-        
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 26, 'endRowIndex': 27, 'startColumnIndex': 4, 'endColumnIndex': 6},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'bold': True, 'fontSize': total_size, 'fontFamily': font_family, 'foregroundColor': {'red': orange_color['red'], 'green': orange_color['green'], 'blue': orange_color['blue']}},
-                        'horizontalAlignment': 'RIGHT',
-                        'numberFormat': {'type': 'CURRENCY', 'pattern': '$#,##0.00'}
-                    }
-                },
-                'fields': 'userEnteredFormat'
+                'range': {'sheetId': worksheet.id, 'startRowIndex': 0, 'endRowIndex': 30, 'startColumnIndex': 0, 'endColumnIndex': 6},
+                'cell': {'userEnteredFormat': {'textFormat': {'fontFamily': self.formatting_config.font_family}}},
+                'fields': 'userEnteredFormat.textFormat.fontFamily'
             }
         })
         
-        # Notes formatting
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 23, 'endRowIndex': 30, 'startColumnIndex': 1, 'endColumnIndex': 4},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': {'fontSize': regular_text_size, 'fontFamily': font_family},
-                        'horizontalAlignment': 'LEFT',
-                        'verticalAlignment': 'TOP',
-                        'wrapStrategy': 'WRAP'
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
-        })
+        return requests
+    
+    def _build_rows(self, data: InvoiceData) -> List[Dict]:
+        """Build the updateCells rows of the 30x6 grid: values and formats for every cell"""
+        if len(data.descriptions) > MAX_LINE_ITEMS:
+            raise ValueError(f"At most {MAX_LINE_ITEMS} line items fit on an invoice, got {len(data.descriptions)}")
         
-        # Header background
-        requests.append({
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': 0, 'endRowIndex': 2, 'startColumnIndex': 0, 'endColumnIndex': 6},
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': {'red': orange_color['red'], 'green': orange_color['green'], 'blue': orange_color['blue']}
-                    }
-                },
-                'fields': 'userEnteredFormat.backgroundColor'
-            }
-        })
+        # Build notes content
+        notes_content = self._build_notes_content(data)
         
-        # Execute all requests in one batch
-        worksheet.spreadsheet.batch_update({'requests': requests})
-    
-    def _create_text_format_request(self, worksheet, start_row: int, end_row: int, start_col: int, end_col: int, 
-                                  font_size: int, font_family: str, bold: bool = False, 
-                                  color: Dict[str, float] = None, alignment: str = 'LEFT') -> Dict:
-        """Helper method to create text formatting requests"""
-        text_format = {
-            'fontSize': font_size,
-            'fontFamily': font_family,
-            'bold': bold
-        }
-        if color:
-            text_format['foregroundColor'] = color
-            
-        return {
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': start_row, 'endRowIndex': end_row, 
-                         'startColumnIndex': start_col, 'endColumnIndex': end_col},
-                'cell': {
-                    'userEnteredFormat': {
-                        'textFormat': text_format,
-                        'horizontalAlignment': alignment
-                    }
-                },
-                'fields': 'userEnteredFormat'
-            }
+        # Per-invoice values are kept as a plain (row, col) -> value grid and wrapped into
+        # CellData on top of the prebuilt template rows
+        amounts = [quantity * unit_price for quantity, unit_price in zip(data.quantities, data.unit_prices)]
+        cell_values = {
+            # Company name and service description
+            (2, 1): data.company_name,
+            (3, 1): data.service_description,
+            # Invoice date
+            (8, 1): data.invoice_date,
+            # Invoice For / Payable To / Invoice # values
+            (11, 1): data.client_name,
+            (11, 3): data.company_name,
+            (11, 5): str(data.invoice_number),
+            # PO Number value
+            (13, 1): data.po_number,
+            # Notes section
+            (23, 1): notes_content,
+            # Total value (calculated on code side from the line amounts, placed in merged E27:F27)
+            (26, 4): sum(amounts),
         }
+        
+        row_template = self._get_row_template()
+        rows = list(row_template)
+        for (row, col), value in cell_values.items():
+            if rows[row] is row_template[row]:
+                rows[row] = {'values': list(rows[row]['values'])}
+            rows[row]['values'][col] = {**rows[row]['values'][col], 'userEnteredValue': _user_entered_value(value)}
+        
+        # Line items (rows 19, 20, etc.), keeping the table's row backgrounds and bottom border
+        line_item_formats = self._get_line_item_formats()
+        for i, line in enumerate(zip(data.descriptions, data.quantities, data.unit_prices, amounts)):
+            description, quantity, unit_price, amount = line
+            values = [None, description, None, quantity, unit_price, amount]
+            rows[LINE_ITEM_START_ROW + i] = {'values': [
+                _cell(_user_entered_value(value), cell_format)
+                for value, cell_format in zip(values, line_item_formats[i])
+            ]}
+        
+        return [_compact_row(row['values']) for row in rows]
     
-    def _create_background_request(self, worksheet, start_row: int, end_row: int, start_col: int, end_col: int, 
-                                 color: Dict[str, float]) -> Dict:
-        """Helper method to create background color requests"""
-        return {
-            'repeatCell': {
-                'range': {'sheetId': worksheet.id, 'startRowIndex': start_row, 'endRowIndex': end_row, 
-                         'startColumnIndex': start_col, 'endColumnIndex': end_col},
-                'cell': {
-                    'userEnteredFormat': {
-                        'backgroundColor': color
-                    }
-                },
-                'fields': 'userEnteredFormat.backgroundColor'
-            }
-        }
+    def _formatting_key(self) -> Tuple:
+        """Hashable key of the formatting profile, so templates with equal formatting share built formats"""
+        f = self.formatting_config
+        return (f.company_name_size, f.invoice_title_size, f.total_size,
+                f.regular_text_size, f.label_text_size, tuple(f.orange_color.items()))
     
-    def _apply_merging_and_widths_in_one_batch(self, worksheet) -> None:
-        """Apply merging and column widths in one batch request"""
-        requests = []
-        
-        # Merging requests
-        merge_requests = [
-            # Header merge (rows 1-2, columns A-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 0, 'endRowIndex': 2, 'startColumnIndex': 0, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Company name merge (row 3, columns B-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 2, 'endRowIndex': 3, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Address merge (row 4, columns B-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 3, 'endRowIndex': 4, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # City/Province merge (row 5, columns B-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 4, 'endRowIndex': 5, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Phone merge (row 6, columns B-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 5, 'endRowIndex': 6, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Invoice title merge (row 8, columns B-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 7, 'endRowIndex': 8, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Invoice date merge (row 9, columns B-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 8, 'endRowIndex': 9, 'startColumnIndex': 1, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Notes merge (rows 24-30, columns A-D)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 23, 'endRowIndex': 30, 'startColumnIndex': 0, 'endColumnIndex': 4},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Total label merge (row 25, columns E-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 24, 'endRowIndex': 25, 'startColumnIndex': 4, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            },
-            # Total value merge (row 27, columns E-F)
-            {
-                'mergeCells': {
-                    'range': {'sheetId': worksheet.id, 'startRowIndex': 26, 'endRowIndex': 27, 'startColumnIndex': 4, 'endColumnIndex': 6},
-                    'mergeType': 'MERGE_ALL'
-                }
-            }
-        ]
-        
-        requests.extend(merge_requests)
-        
-        # Column width requests
-        width_requests = [
-            {'updateDimensionProperties': {'range': {'sheetId': worksheet.id, 'dimension': 'COLUMNS', 'startIndex': 0, 'endIndex': 1}, 'properties': {'pixelSize': 30}, 'fields': 'pixelSize'}},
-            {'updateDimensionProperties': {'range': {'sheetId': worksheet.id, 'dimension': 'COLUMNS', 'startIndex': 1, 'endIndex': 2}, 'properties': {'pixelSize': 200}, 'fields': 'pixelSize'}},
-            {'updateDimensionProperties': {'range': {'sheetId': worksheet.id, 'dimension': 'COLUMNS', 'startIndex': 2, 'endIndex': 3}, 'properties': {'pixelSize': 50}, 'fields': 'pixelSize'}},
-            {'updateDimensionProperties': {'range': {'sheetId': worksheet.id, 'dimension': 'COLUMNS', 'startIndex': 3, 'endIndex': 4}, 'properties': {'pixelSize': 60}, 'fields': 'pixelSize'}},
-            {'updateDimensionProperties': {'range': {'sheetId': worksheet.id, 'dimension': 'COLUMNS', 'startIndex': 4, 'endIndex': 5}, 'properties': {'pixelSize': 80}, 'fields': 'pixelSize'}},
-            {'updateDimensionProperties': {'range': {'sheetId': worksheet.id, 'dimension': 'COLUMNS', 'startIndex': 5, 'endIndex': 6}, 'properties': {'pixelSize': 100}, 'fields': 'pixelSize'}},
-        ]
-        
-        requests.extend(width_requests)
-        
-        # Execute all requests in one batch
-        worksheet.spreadsheet.batch_update({'requests': requests})
+    def _get_row_template(self) -> List[Dict]:
+        """Get the static rows with formats attached for this template's formatting"""
+        return _row_template(self._formatting_key())
+    
+    def _get_line_item_formats(self) -> Tuple[List[Dict], ...]:
+        """Get the per-column formats of each line item row"""
+        return _line_item_formats(self._formatting_key())
     
+    def _build_merge_and_width_requests(self, worksheet) -> List[Dict]:
+        """Build the merging and column width requests"""
+        return list(_layout_requests(worksheet.id))
     
     def _build_notes_content(self, data: InvoiceData) -> str:
         """Build notes content"""
-        notes_config = self.config_loader.get_notes_config()
-        content = "Notes:"
+        notes = self.notes_config
+        parts = ["Notes:"]
         
         # Check for holidays in the last two weeks
         holidays_in_period = self._get_canadian_holidays_in_period()
         
         # Add holiday information if applicable
-        if notes_config.get('include_holidays', True) and holidays_in_period:
-            content += "\n\nCanadian Statutory Holidays (Paid Days Off):"
-            for holiday in holidays_in_period:
-                content += f"\n• {holiday['date']}: {holiday['name']}"
+        if notes.include_holidays and holidays_in_period:
+            parts.append("\n\nCanadian Statutory Holidays (Paid Days Off):")
+            parts.extend(f"\n• {holiday['date']}: {holiday['name']}" for holiday in holidays_in_period)
         
         # Add custom notes - automatically include holiday names if holidays detected
-        custom_notes = notes_config.get('custom_notes', '')
+        custom_notes = notes.custom_notes
         if holidays_in_period and not custom_notes:
             # Auto-generate custom notes with holiday names
             holiday_names = [holiday['name'] for holiday in holidays_in_period]
@@ -754,29 +720,13 @@ class InvoiceTemplate:
                 custom_notes = f"Note: Holiday hours for {holiday_list} are included in regular billing."
         
         if custom_notes:
-            content += f"\n\n{custom_notes}"
+            parts.append(f"\n\n{custom_notes}")
         
-        return content
+        return "".join(parts)
     
     def _get_canadian_holidays_in_period(self) -> List[Dict[str, str]]:
         """Get Canadian holidays in the last two weeks"""
-        end_date = datetime.datetime.now()
-        start_date = datetime.datetime.now() - datetime.timedelta(days=14)
-        
-        ca_holidays = holidays.Canada()
-        holidays_in_period = []
-        current_date = start_date
-        
-        while current_date <= end_date:
-            if current_date.date() in ca_holidays:
-                holiday_name = ca_holidays.get(current_date.date())
-                holidays_in_period.append({
-                    'date': current_date.strftime('%B %d'),
-                    'name': holiday_name
-                })
-            current_date += datetime.timedelta(days=1)
-        
-        return holidays_in_period
+        return list(_canadian_holidays_in_period(datetime.date.today()))
 
 # Usage example
 def main():